@@ -2,10 +2,24 @@
 # FastAPI service
 
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple, Callable, Generator, Iterator
+import anyio.to_thread
+import asyncio
+import functools
+import importlib.util
+import json
 import os
 import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from migrations.manager import MigrationStore
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -21,9 +35,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("db-migration")
 
+# Upper bound on a migration's concurrent table/key-range workers
+MAX_PARALLELISM = 32
+
 # Models
 class DatabaseConfig(BaseModel):
-    db_type: str  # "postgres", "mysql", "sqlite"
+    db_type: str  # "postgres", "mysql", "sqlite", "oracle"
     host: Optional[str] = None
     port: Optional[int] = None
     username: Optional[str] = None
@@ -37,15 +54,99 @@ class MigrationRequest(BaseModel):
     tables: Optional[List[str]] = None
     exclude_tables: Optional[List[str]] = None
     only_schema: bool = False
-    batch_size: int = 1000
+    batch_size: int = Field(1000, ge=1)  # upper bound on rows per batch
+    batch_bytes: int = Field(32 * 1024 * 1024, ge=1)  # memory budget per batch
+    parallelism: int = Field(4, ge=1, le=MAX_PARALLELISM)
 
 class MigrationResponse(BaseModel):
     migration_id: str
     status: str
     details: Optional[Dict[str, Any]] = None
+    created_at: Optional[float] = None  # Unix timestamp; ids are random, so order by this
+
+# Persistent store for migrations
+store = MigrationStore(os.getenv("MIGRATIONS_DB", "migrations.db"))
+
+# Minimum interval between progress writes to the store
+PROGRESS_FLUSH_SECONDS = 1.0
+
+# Entries kept in a migration's audit log; older entries are dropped
+MIGRATION_LOG_SIZE = 1000
+
+# Threads available to sync handlers and background migrations (anyio's default is 40)
+WORKER_THREADS = 200
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+# Guards lazy creation of the per-target PostgreSQL pools
+_pg_pools_lock = threading.Lock()
+
+# Events set on the next update of a migration; only touched on the event loop
+progress_events: Dict[str, asyncio.Event] = {}
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+@app.on_event("startup")
+async def startup():
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+    
+    # Each running migration holds a worker thread for its whole duration
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    
+    # PostgreSQL connection pools, keyed by target database
+    app.state.pg_pools = {}
+
+@app.on_event("shutdown")
+async def shutdown():
+    for pool in app.state.pg_pools.values():
+        pool.close()
+    app.state.pg_pools.clear()
+    store.close()
+
+def update_migration(
+    migration_id: str,
+    status: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None
+):
+    """Update a migration in the store and wake its event stream subscribers"""
+    store.update(migration_id, status=status, details=details)
+    if _event_loop is not None:
+        # Called from worker threads; the events belong to the event loop
+        _event_loop.call_soon_threadsafe(_notify_progress, migration_id)
+
+def _notify_progress(migration_id: str):
+    """Wake everyone waiting for the next update of a migration"""
+    event = progress_events.pop(migration_id, None)
+    if event is not None:
+        event.set()
+
+def get_postgres_pool(db: DatabaseConfig, connections: int):
+    """Get (or create) a PostgreSQL target's shared pool, grown by `connections` until release_postgres_pool()"""
+    from engines.postgres import create_pool
+    
+    key: Tuple = (db.host, db.port, db.username, db.password, db.database_name, db.ssl_mode)
+    with _pg_pools_lock:
+        pool = app.state.pg_pools.get(key)
+        if pool is None:
+            pool = create_pool(
+                host=db.host,
+                port=db.port,
+                username=db.username,
+                password=db.password,
+                database=db.database_name,
+                ssl_mode=db.ssl_mode,
+                max_size=connections
+            )
+            app.state.pg_pools[key] = pool
+        else:
+            pool.resize(pool.min_size, pool.max_size + connections)
+        return pool
 
-# In-memory store for migrations (replace with a real DB in production)
-migrations = {}
+def release_postgres_pool(pool, connections: int):
+    """Shrink a target's pool by the connections reserved with get_postgres_pool()"""
+    with _pg_pools_lock:
+        pool.resize(pool.min_size, max(pool.min_size, pool.max_size - connections))
 
 # Routes
 @app.get("/")
@@ -53,52 +154,78 @@ async def root():
     return {"message": "MCP Database Migration Service", "status": "running"}
 
 @app.post("/migrations", response_model=MigrationResponse)
-async def create_migration(request: MigrationRequest, background_tasks: BackgroundTasks):
-    migration_id = f"migration-{len(migrations) + 1}"
-    
-    # Store migration details
-    migrations[migration_id] = {
-        "request": request.dict(),
-        "status": "pending",
-        "details": None
-    }
+def create_migration(request: MigrationRequest, background_tasks: BackgroundTasks):
+    # Random ids need no coordination between concurrent requests
+    migration_id = uuid.uuid4().hex
+    
+    # Store migration details (credentials are not persisted)
+    store.create(
+        migration_id,
+        request.dict(exclude={"source_db": {"password"}, "target_db": {"password"}})
+    )
     
     # Schedule migration task
     background_tasks.add_task(run_migration, migration_id, request)
     
-    return MigrationResponse(
-        migration_id=migration_id,
-        status="pending"
-    )
+    return to_response(store.get(migration_id))
 
 @app.get("/migrations/{migration_id}", response_model=MigrationResponse)
-async def get_migration(migration_id: str):
-    if migration_id not in migrations:
+def get_migration(migration_id: str):
+    migration = store.get(migration_id)
+    if migration is None:
         raise HTTPException(status_code=404, detail="Migration not found")
     
-    migration = migrations[migration_id]
+    return to_response(migration)
+
+@app.get("/migrations/{migration_id}/events")
+async def migration_events(migration_id: str):
+    """Stream a migration's state as Server-Sent Events until it finishes"""
+    if await run_in_threadpool(store.get, migration_id) is None:
+        raise HTTPException(status_code=404, detail="Migration not found")
     
+    async def stream():
+        while True:
+            # Take the event before reading so an update in between is not missed
+            event = progress_events.setdefault(migration_id, asyncio.Event())
+            migration = await run_in_threadpool(store.get, migration_id)
+            yield f"data: {json.dumps(to_response(migration).dict())}\n\n"
+            
+            if migration["status"] not in ("pending", "running"):
+                # Wake the other subscribers too: the final update's own
+                # notification may already have run, or find no event left
+                _notify_progress(migration_id)
+                return
+                
+            try:
+                await asyncio.wait_for(event.wait(), timeout=EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@app.get("/migrations", response_model=List[MigrationResponse])
+def list_migrations():
+    return [to_response(m) for m in store.list()]
+
+def to_response(migration: Dict[str, Any]) -> MigrationResponse:
+    """Build the API response for a stored migration"""
     return MigrationResponse(
-        migration_id=migration_id,
+        migration_id=migration["id"],
         status=migration["status"],
-        details=migration["details"]
+        details=migration["details"],
+        created_at=migration["created"]
     )
 
-@app.get("/migrations", response_model=List[MigrationResponse])
-async def list_migrations():
-    return [
-        MigrationResponse(
-            migration_id=mid,
-            status=m["status"],
-            details=m["details"]
-        )
-        for mid, m in migrations.items()
-    ]
-
 # Migration executor
-async def run_migration(migration_id: str, request: MigrationRequest):
+# Migrations are plain functions: BackgroundTasks runs them in the thread pool,
+# so their blocking driver calls never stall the event loop
+def run_migration(migration_id: str, request: MigrationRequest):
+    if request.source_db.db_type == "oracle" and request.target_db.db_type == "postgres":
+        run_oracle_to_postgres_migration(migration_id, request)
+        return
+    
     logger.info(f"Starting migration {migration_id}")
-    migrations[migration_id]["status"] = "running"
+    update_migration(migration_id, status="running")
     
     try:
         # TODO: Implement the actual migration logic
@@ -107,68 +234,59 @@ async def run_migration(migration_id: str, request: MigrationRequest):
         # 3. Data transfer with proper batching
         
         # For now, we'll just simulate a successful migration
-        import time
-        time.sleep(2)  # Simulate work
-        
-        migrations[migration_id]["status"] = "completed"
-        migrations[migration_id]["details"] = {
+        update_migration(migration_id, status="completed", details={
             "tables_migrated": request.tables or ["all tables"],
             "rows_transferred": 1000,
-            "duration_seconds": 2
-        }
+            "duration_seconds": 0
+        })
         logger.info(f"Migration {migration_id} completed successfully")
         
     except Exception as e:
         logger.error(f"Migration {migration_id} failed: {str(e)}")
-        migrations[migration_id]["status"] = "failed"
-        migrations[migration_id]["details"] = {"error": str(e)}
+        update_migration(migration_id, status="failed", details={"error": str(e)})
         
 # In api.py, add this function:
 
-async def run_oracle_to_postgres_migration(migration_id: str, request: MigrationRequest):
+def run_oracle_to_postgres_migration(migration_id: str, request: MigrationRequest):
     """
     Specialized function for Oracle to PostgreSQL migrations, with special handling
     for healthcare data and compliance requirements.
     """
     logger.info(f"Starting Oracle to PostgreSQL migration {migration_id}")
-    migrations[migration_id]["status"] = "running"
+    record = MigrationRecord(migration_id)
     
     # Update migration phases
-    migrations[migration_id]["details"]["current_phase"] = "schema_analysis"
+    record.details["current_phase"] = "schema_analysis"
+    record.save(status="running")
     
     try:
-        # Import our connectors
-        from engines.oracle import OracleConnector
-        from engines.postgres import PostgresConnector
+        from engines.oracle import create_pool as create_oracle_pool
         
-        # Connect to source (Oracle)
-        oracle = OracleConnector(
+        # Sessions for the schema pass plus one per data worker
+        oracle_pool = create_oracle_pool(
             host=request.source_db.host,
             port=request.source_db.port,
             username=request.source_db.username,
             password=request.source_db.password,
-            service_name=request.source_db.database_name
+            service_name=request.source_db.database_name,
+            max_size=request.parallelism + 1
         )
-        oracle.connect()
+        # One connection per data worker, with as many again in reserve; Arrow
+        # ingestion adds up to one ADBC connection per worker outside the pool
+        pg_connections = request.parallelism * 2
+        pg_pool = get_postgres_pool(request.target_db, pg_connections)
         
-        # Connect to target (PostgreSQL)
-        postgres = PostgresConnector(
-            host=request.target_db.host,
-            port=request.target_db.port,
-            username=request.target_db.username,
-            password=request.target_db.password,
-            database=request.target_db.database_name,
-            ssl_mode=request.target_db.ssl_mode
-        )
-        postgres.connect()
+        # Connect to source (Oracle) and target (PostgreSQL)
+        oracle = open_oracle(request.source_db, oracle_pool)
+        postgres = open_postgres(request.target_db, pg_pool)
         
         # Get list of tables to migrate
         tables = request.tables or oracle.get_tables()
         if request.exclude_tables:
             tables = [t for t in tables if t not in request.exclude_tables]
             
-        # Create audit log for the migration
-        migration_log = []
+        # Create audit log for the migration (keeps the most recent entries)
+        migration_log = deque(maxlen=MIGRATION_LOG_SIZE)
         
         # Track statistics
         stats = {
@@ -180,10 +298,12 @@ async def run_oracle_to_postgres_migration(migration_id: str, request: Migration
         }
         
         # Update migration details
-        migrations[migration_id]["details"]["tables"] = tables
-        migrations[migration_id]["details"]["stats"] = stats
+        record.details["tables"] = tables
+        record.details["stats"] = stats
+        record.save()
         
         # Phase 1: Schema Analysis and Conversion
+        schemas = {}
         for table_name in tables:
             logger.info(f"Analyzing schema for table {table_name}")
             migration_log.append(f"Analyzing schema for table {table_name}")
@@ -192,98 +312,503 @@ async def run_oracle_to_postgres_migration(migration_id: str, request: Migration
             oracle_schema = oracle.get_schema(table_name)
             
             # Update migration phase
-            migrations[migration_id]["details"]["current_phase"] = "type_conversion"
-            migrations[migration_id]["details"]["current_table"] = table_name
+            record.details["current_phase"] = "type_conversion"
+            record.details["current_table"] = table_name
             
             # Convert Oracle schema to PostgreSQL schema
             pg_schema = convert_oracle_to_postgres_schema(oracle_schema)
-            
-            # Create table in PostgreSQL
-            postgres.create_table_from_schema(pg_schema)
+            schemas[table_name] = (oracle_schema, pg_schema)
             
             # Update stats
             stats["tables_processed"] += 1
             stats["schema_conversions"] += 1
             
             # Update migration details
-            migrations[migration_id]["details"]["stats"] = stats
+            record.save(force=False)
+        
+        # Create all tables in PostgreSQL with a single pipelined round trip;
+        # tables about to be loaded get their primary keys after the data
+        postgres.create_tables_from_schemas(
+            [pg_schema for _, pg_schema in schemas.values()],
+            bulk_load=not request.only_schema
+        )
+        
+        # Hand the connection back; the data workers take their own from the pool
+        postgres.disconnect()
+        
+        # Phase 2: Data Migration (if not schema-only)
+        if not request.only_schema:
+            record.details["current_phase"] = "data_migration"
+            # UNLOGGED and without primary keys until finalized; left in the
+            # details if the migration fails before then
+            record.details["unfinalized_tables"] = [
+                pg_schema["table_name"] for _, pg_schema in schemas.values()
+            ]
+            record.save()
             
-            # Phase 2: Data Migration (if not schema-only)
-            if not request.only_schema:
-                migrations[migration_id]["details"]["current_phase"] = "data_migration"
-                
-                # Determine total rows for progress tracking
-                row_count = get_oracle_table_row_count(oracle, table_name)
-                rows_migrated = 0
-                
-                # Process in batches
-                batch_size = request.batch_size
-                offset = 0
-                
-                while offset < row_count:
-                    # Fetch batch of data from Oracle
-                    oracle_data = oracle.fetch_data(table_name, batch_size, offset)
-                    
-                    if not oracle_data:
-                        break
-                        
-                    # Transform data as needed (data type conversions, etc.)
-                    postgres_data = transform_oracle_to_postgres_data(
-                        oracle_data, 
-                        oracle_schema, 
-                        pg_schema
-                    )
-                    
-                    # Insert data into PostgreSQL
-                    postgres.insert_data(table_name, postgres_data)
-                    
-                    # Update progress
-                    rows_migrated += len(oracle_data)
-                    stats["rows_migrated"] += len(oracle_data)
-                    migrations[migration_id]["details"]["stats"] = stats
-                    migrations[migration_id]["details"]["progress"] = {
-                        "table": table_name,
-                        "rows_processed": rows_migrated,
-                        "total_rows": row_count,
-                        "percentage": min(100, int((rows_migrated / row_count) * 100)) if row_count > 0 else 100
-                    }
-                    
-                    # Log progress
-                    logger.info(f"Migrated {rows_migrated}/{row_count} rows from {table_name}")
-                    migration_log.append(f"Migrated {rows_migrated}/{row_count} rows from {table_name}")
-                    
-                    # Move to next batch
-                    offset += batch_size
+            transfer = DataTransfer(
+                record, request, oracle_pool, pg_pool, stats, migration_log
+            )
+            migrate_tables_data(transfer, oracle, schemas)
+            
+            # Phase 2.5: Make the loaded tables logged and build their primary keys
+            record.details["current_phase"] = "constraint_creation"
+            record.save()
+            finalize_tables(transfer, schemas)
+            del record.details["unfinalized_tables"]
         
         # Phase 3: PL/SQL Conversion (simplified for demo)
-        migrations[migration_id]["details"]["current_phase"] = "plsql_conversion"
+        record.details["current_phase"] = "plsql_conversion"
+        record.save()
         # Code for PL/SQL conversion would go here
         
         # Phase 4: Validation
-        migrations[migration_id]["details"]["current_phase"] = "validation"
+        record.details["current_phase"] = "validation"
+        record.save()
         # Validation logic would go here
         
         # Migration complete
-        migrations[migration_id]["status"] = "completed"
-        migrations[migration_id]["details"]["current_phase"] = "completed"
-        migrations[migration_id]["details"]["migration_log"] = migration_log
-        migrations[migration_id]["details"]["duration_seconds"] = calculate_duration(migration_id)
+        record.details["current_phase"] = "completed"
+        record.details["migration_log"] = list(migration_log)
+        record.details["duration_seconds"] = calculate_duration(migration_id)
+        record.save(status="completed")
         logger.info(f"Oracle to PostgreSQL migration {migration_id} completed successfully")
         
     except Exception as e:
         logger.error(f"Migration {migration_id} failed: {str(e)}")
-        migrations[migration_id]["status"] = "failed"
-        migrations[migration_id]["details"]["error"] = str(e)
-        migrations[migration_id]["details"]["current_phase"] = "failed"
+        record.details["error"] = str(e)
+        record.details["current_phase"] = "failed"
+        if record.details.get("unfinalized_tables"):
+            logger.warning(
+                f"Migration {migration_id} left tables UNLOGGED without primary keys: "
+                f"{', '.join(record.details['unfinalized_tables'])}"
+            )
+        record.save(status="failed")
     finally:
         # Clean up connections
         if 'oracle' in locals():
             oracle.disconnect()
         if 'postgres' in locals():
             postgres.disconnect()
+        if 'oracle_pool' in locals():
+            oracle_pool.close()
+        if 'pg_pool' in locals():
+            release_postgres_pool(pg_pool, pg_connections)
 
 # Helper functions for the migration
 
+# Number of fetched batches allowed to wait for the consumer; bounds memory
+PREFETCH_BATCHES = 2
+
+# Marks the end of a table's data in the batch queue
+_END_OF_DATA = object()
+
+# Tables with fewer rows than this are copied by a single worker
+SHARD_MIN_ROWS = 1_000_000
+
+def open_oracle(db: DatabaseConfig, pool=None):
+    """Create and connect an Oracle connector, optionally backed by a session pool"""
+    from engines.oracle import OracleConnector
+    
+    oracle = OracleConnector(
+        host=db.host,
+        port=db.port,
+        username=db.username,
+        password=db.password,
+        service_name=db.database_name,
+        pool=pool
+    )
+    oracle.connect()
+    return oracle
+
+def open_postgres(db: DatabaseConfig, pool=None, adbc_connections=None):
+    """Create and connect a PostgreSQL connector, optionally backed by a connection pool"""
+    from engines.postgres import PostgresConnector
+    
+    postgres = PostgresConnector(
+        host=db.host,
+        port=db.port,
+        username=db.username,
+        password=db.password,
+        database=db.database_name,
+        ssl_mode=db.ssl_mode,
+        pool=pool,
+        adbc_connections=adbc_connections
+    )
+    postgres.connect()
+    return postgres
+
+class MigrationRecord:
+    """Working copy of a migration's details; save(force=False) writes at most once per PROGRESS_FLUSH_SECONDS"""
+    
+    def __init__(self, migration_id: str):
+        self.migration_id = migration_id
+        self.details: Dict[str, Any] = {}
+        # Reentrant so workers can save while holding it around their updates
+        self.lock = threading.RLock()
+        self._last_save = 0.0
+        
+    def save(self, status: Optional[str] = None, force: bool = True):
+        """Persist the details (and status, if given) to the store"""
+        with self.lock:
+            now = time.monotonic()
+            if not force and status is None and now - self._last_save < PROGRESS_FLUSH_SECONDS:
+                return
+            self._last_save = now
+            update_migration(self.migration_id, status=status, details=self.details)
+
+class DataTransfer:
+    """State shared by the workers copying a migration's table data"""
+    
+    def __init__(
+        self,
+        record: MigrationRecord,
+        request: MigrationRequest,
+        oracle_pool,
+        pg_pool,
+        stats: Dict[str, int],
+        migration_log: deque
+    ):
+        self.record = record
+        self.request = request
+        self.oracle_pool = oracle_pool
+        self.pg_pool = pg_pool
+        self.stats = stats
+        self.migration_log = migration_log
+        self.progress = record.details.setdefault("progress", {})
+        # Per-worker ADBC connections for Arrow ingestion, set while the data is copied
+        self.adbc_connections = None
+        # Set when any worker fails so the others stop early
+        self.abort = threading.Event()
+        
+    def add_table(self, table_name: str, row_count: int):
+        """Start tracking progress for a table; row_count <= 0 means unknown"""
+        self.progress[table_name] = {
+            "rows_processed": 0,
+            "total_rows": row_count if row_count > 0 else None,
+            "percentage": 0 if row_count > 0 else None
+        }
+        
+    def log(self, message: str):
+        """Add an entry to the migration's audit log"""
+        with self.record.lock:
+            self.migration_log.append(message)
+        logger.info(message)
+        
+    def record_batch(self, table_name: str, row_count: int):
+        """Account for a batch copied by one of the workers"""
+        with self.record.lock:
+            self.stats["rows_migrated"] += row_count
+            table_progress = self.progress[table_name]
+            table_progress["rows_processed"] += row_count
+            rows_migrated = table_progress["rows_processed"]
+            total_rows = table_progress["total_rows"]
+            if total_rows:
+                # The total is an estimate, so don't let the percentage overshoot
+                table_progress["percentage"] = min(100, int((rows_migrated / total_rows) * 100))
+            
+            # Log progress; skip formatting entirely when INFO is filtered out
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Migrated %d/%s rows from %s", rows_migrated, total_rows or "?", table_name)
+            
+            self.record.save(force=False)
+
+def migrate_tables_data(
+    transfer: DataTransfer,
+    oracle,
+    schemas: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]
+):
+    """Copy the data of all tables with up to request.parallelism workers, splitting large tables into key ranges"""
+    parallelism = transfer.request.parallelism
+    
+    work = []
+    for table_name, (oracle_schema, pg_schema) in schemas.items():
+        # Determine total rows for progress tracking
+        row_count = get_oracle_table_row_count(oracle, table_name)
+        transfer.add_table(table_name, row_count)
+        
+        key_column = pagination_key(oracle_schema)
+        for key_range in plan_key_ranges(oracle, table_name, key_column, row_count, parallelism):
+            work.append((table_name, oracle_schema, pg_schema, key_range))
+    
+    from engines.postgres import AdbcConnections
+    
+    # Each worker keeps its ADBC connection across tables instead of
+    # reconnecting for every table or key range
+    transfer.adbc_connections = AdbcConnections()
+    try:
+        with ThreadPoolExecutor(
+            max_workers=parallelism,
+            thread_name_prefix=f"migration-{transfer.record.migration_id[:8]}"
+        ) as executor:
+            futures = [
+                executor.submit(migrate_table_data, transfer, *unit)
+                for unit in work
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                transfer.abort.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+    finally:
+        transfer.adbc_connections.close()
+        transfer.adbc_connections = None
+
+def finalize_tables(
+    transfer: DataTransfer,
+    schemas: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]
+):
+    """Finalize the bulk-loaded tables, up to request.parallelism at a time"""
+    workers = max(1, min(transfer.request.parallelism, len(schemas)))
+    
+    def finalize(pg_schema: Dict[str, Any]):
+        postgres = open_postgres(transfer.request.target_db, transfer.pg_pool)
+        try:
+            # Concurrent primary key builds split the sort memory between them
+            postgres.finalize_table(pg_schema, concurrency=workers)
+        finally:
+            postgres.disconnect()
+        with transfer.record.lock:
+            transfer.record.details["unfinalized_tables"].remove(pg_schema["table_name"])
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(finalize, [pg_schema for _, pg_schema in schemas.values()]):
+            pass
+
+def plan_key_ranges(
+    oracle,
+    table_name: str,
+    key_column: Optional[str],
+    row_count: int,
+    parallelism: int
+) -> List[Optional[Tuple[int, int]]]:
+    """Split a large table with an integer primary key into half-open key ranges; [None] copies it whole"""
+    if key_column is None or parallelism < 2 or row_count < SHARD_MIN_ROWS:
+        return [None]
+        
+    low, high = oracle.get_key_bounds(table_name, key_column)
+    if not isinstance(low, int) or not isinstance(high, int):
+        return [None]
+        
+    step = -(-(high - low + 1) // parallelism)
+    return [(start, min(start + step, high + 1)) for start in range(low, high + 1, step)]
+
+def migrate_table_data(
+    transfer: DataTransfer,
+    table_name: str,
+    oracle_schema: Dict[str, Any],
+    pg_schema: Dict[str, Any],
+    key_range: Optional[Tuple[int, int]] = None
+) -> int:
+    """Copy one table (or key range) from Oracle to PostgreSQL, as Arrow batches when possible, else as rows"""
+    request = transfer.request
+    oracle = open_oracle(request.source_db, transfer.oracle_pool)
+    try:
+        postgres = open_postgres(request.target_db, transfer.pg_pool, transfer.adbc_connections)
+        try:
+            # Resolve column names and converters once for the whole table
+            column_plan = build_column_plan(oracle_schema, pg_schema)
+            
+            arrow_schema = arrow_transfer_schema(oracle, pg_schema, column_plan)
+            if arrow_schema is not None:
+                try:
+                    return copy_table_batches(
+                        transfer, oracle, postgres, table_name, oracle_schema, pg_schema,
+                        column_plan, key_range, arrow_schema=arrow_schema
+                    )
+                except ArrowTransferRejected as e:
+                    logger.warning(f"Arrow transfer rejected for {table_name}, copying rows instead: {str(e)}")
+            
+            return copy_table_batches(
+                transfer, oracle, postgres, table_name, oracle_schema, pg_schema,
+                column_plan, key_range
+            )
+        finally:
+            postgres.disconnect()
+    finally:
+        oracle.disconnect()
+
+class ArrowTransferRejected(Exception):
+    """The first Arrow batch of a table could not be fetched or written; nothing was written"""
+
+def arrow_transfer_schema(
+    oracle,
+    pg_schema: Dict[str, Any],
+    column_plan: List[Tuple[str, str, Optional[Callable[[Any], Any]]]]
+) -> Optional[Any]:
+    """Arrow schema to cast a table's batches to, or None if it can't take the Arrow/ADBC path"""
+    if any(convert is not None for _, _, convert in column_plan):
+        # LOB columns still need per-value reads
+        return None
+    if not hasattr(oracle.connection, "fetch_df_batches"):
+        return None
+    if not all(
+        importlib.util.find_spec(module) is not None
+        for module in ("pyarrow", "adbc_driver_postgresql")
+    ):
+        return None
+    
+    from engines.postgres import arrow_schema
+    return arrow_schema(pg_schema, [pg_name for pg_name, _, _ in column_plan])
+
+def copy_table_batches(
+    transfer: DataTransfer,
+    oracle,
+    postgres,
+    table_name: str,
+    oracle_schema: Dict[str, Any],
+    pg_schema: Dict[str, Any],
+    column_plan: List[Tuple[str, str, Optional[Callable[[Any], Any]]]],
+    key_range: Optional[Tuple[int, int]],
+    arrow_schema: Optional[Any] = None
+) -> int:
+    """Move a table's batches to PostgreSQL while a producer thread fetches the next ones from Oracle"""
+    arrow = arrow_schema is not None
+    if arrow:
+        from engines.postgres import cast_to_arrow_schema
+    
+    pg_columns = [pg_name for pg_name, _, _ in column_plan]
+    oracle_columns = [oracle_name for _, oracle_name, _ in column_plan]
+    converters = [convert for _, _, convert in column_plan]
+    batch_size = transfer.request.batch_size
+    key_column = pagination_key(oracle_schema)
+    rows_migrated = 0
+    
+    if arrow:
+        source = oracle.fetch_arrow_batches(
+            table_name, batch_size, oracle_columns, key_column, key_range
+        )
+    else:
+        source = iter_oracle_batches(
+            oracle, table_name, batch_size, transfer.request.batch_bytes,
+            key_column, oracle_columns, key_range
+        )
+    
+    batches = queue.Queue(maxsize=PREFETCH_BATCHES)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=produce_oracle_batches,
+        args=(source, batches, stop),
+        name=f"oracle-fetch-{table_name}",
+        daemon=True
+    )
+    producer.start()
+    
+    try:
+        while not transfer.abort.is_set():
+            oracle_data = batches.get()
+            if oracle_data is _END_OF_DATA:
+                break
+            if isinstance(oracle_data, Exception):
+                if arrow and rows_migrated == 0:
+                    # The DataFrame fetch does not support every Oracle column type
+                    raise ArrowTransferRejected(str(oracle_data)) from oracle_data
+                raise oracle_data
+                
+            if arrow:
+                # Columns arrive in plan order; give them the target names and
+                # types, since binary COPY does not convert them
+                try:
+                    batch_rows = postgres.ingest_arrow(
+                        pg_schema["table_name"],
+                        cast_to_arrow_schema(oracle_data, arrow_schema),
+                        commit=False
+                    )
+                except Exception as e:
+                    if rows_migrated == 0:
+                        raise ArrowTransferRejected(str(e)) from e
+                    raise
+            else:
+                # Transform data as needed (data type conversions, etc.)
+                postgres_data = transform_oracle_to_postgres_data(oracle_data, converters)
+                
+                # Insert data into PostgreSQL
+                batch_rows = postgres.insert_data(
+                    pg_schema["table_name"], pg_columns, postgres_data, commit=False
+                )
+            
+            rows_migrated += batch_rows
+            transfer.record_batch(table_name, batch_rows)
+            
+        # The whole table (or key range) is loaded in a single transaction;
+        # on failure it is rolled back when the connection goes back to the pool
+        if not transfer.abort.is_set():
+            postgres.commit()
+            key_info = f" (keys {key_range[0]} to {key_range[1]})" if key_range else ""
+            transfer.log(f"Migrated {rows_migrated} rows from {table_name}{key_info}")
+            transfer.record.save()
+    finally:
+        # Release a producer blocked on a full queue if we bailed out early
+        stop.set()
+        producer.join()
+        
+    return rows_migrated
+
+def iter_oracle_batches(
+    oracle,
+    table_name: str,
+    batch_size: int,
+    batch_bytes: int,
+    key_column: Optional[str],
+    columns: List[str],
+    key_range: Optional[Tuple[int, int]] = None
+) -> Generator[List[tuple], None, None]:
+    """Yield row batches using keyset pagination, capped at batch_size rows and about batch_bytes"""
+    rows_per_fetch = batch_size
+    last_key = None
+    while True:
+        oracle_data, last_key = oracle.fetch_data(
+            table_name, rows_per_fetch, last_key, key_column, columns, key_range,
+            max_bytes=batch_bytes
+        )
+        
+        if not oracle_data:
+            return
+            
+        yield oracle_data
+        
+        rows_per_fetch = tune_batch_rows(oracle_data, batch_size, batch_bytes)
+
+def tune_batch_rows(oracle_data: List[tuple], batch_size: int, batch_bytes: int) -> int:
+    """Rows per fetch that fit the memory budget, estimated from a sample of a batch"""
+    from engines.oracle import estimate_row_size
+    
+    sample = oracle_data[:100]
+    row_bytes = sum(estimate_row_size(row) for row in sample) / len(sample)
+    return max(1, min(batch_size, int(batch_bytes // max(row_bytes, 1))))
+
+def produce_oracle_batches(source: Generator[Any, None, None], batches: queue.Queue, stop: threading.Event):
+    """Fetch batches from Oracle into the queue until the table is exhausted"""
+    try:
+        for oracle_data in source:
+            if stop.is_set():
+                return
+            _put_batch(batches, oracle_data, stop)
+            
+        _put_batch(batches, _END_OF_DATA, stop)
+    except Exception as e:
+        # Surface the failure to the consumer thread
+        _put_batch(batches, e, stop)
+    finally:
+        # Release the Oracle cursor if we stopped part way through
+        source.close()
+
+def pagination_key(oracle_schema: Dict[str, Any]) -> Optional[str]:
+    """Pick the column to paginate on: a single-column primary key, else ROWID (None)"""
+    primary_keys = oracle_schema["primary_keys"]
+    return primary_keys[0] if len(primary_keys) == 1 else None
+
+def _put_batch(batches: queue.Queue, item: Any, stop: threading.Event):
+    """Put an item on the queue, giving up once the consumer has stopped"""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
 def convert_oracle_to_postgres_schema(oracle_schema: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Oracle schema to PostgreSQL schema"""
     # Data type mapping
@@ -335,55 +860,81 @@ def convert_oracle_to_postgres_schema(oracle_schema: Dict[str, Any]) -> Dict[str
     
     return pg_schema
 
-def transform_oracle_to_postgres_data(
-    oracle_data: List[Dict[str, Any]], 
-    oracle_schema: Dict[str, Any], 
+def build_column_plan(
+    oracle_schema: Dict[str, Any],
     pg_schema: Dict[str, Any]
-) -> List[Dict[str, Any]]:
-    """Transform Oracle data to fit PostgreSQL schema"""
-    result = []
+) -> List[Tuple[str, str, Optional[Callable[[Any], Any]]]]:
+    """Map each PostgreSQL column to its Oracle column and value converter, as (pg_name, oracle_name, converter)"""
+    name_map = {c["column_name"].lower(): c["column_name"] for c in oracle_schema["columns"]}
+    type_map = {c["column_name"]: c["data_type"] for c in oracle_schema["columns"]}
     
-    for row in oracle_data:
-        pg_row = {}
-        
-        for pg_col in pg_schema["columns"]:
-            col_name = pg_col["column_name"]
-            oracle_col_name = next(
-                (c["column_name"] for c in oracle_schema["columns"] 
-                 if c["column_name"].lower() == col_name),
-                None
-            )
-            
-            if oracle_col_name and oracle_col_name in row:
-                value = row[oracle_col_name]
-                
-                # Handle data type conversions
-                # Example: CLOB to TEXT
-                if value is not None:
-                    oracle_type = next(
-                        c["data_type"] for c in oracle_schema["columns"] 
-                        if c["column_name"] == oracle_col_name
-                    )
-                    
-                    if oracle_type == "CLOB":
-                        # Convert CLOB to text
-                        value = str(value.read()) if hasattr(value, 'read') else str(value)
-                    elif oracle_type == "BLOB":
-                        # Convert BLOB to bytea
-                        value = bytes(value.read()) if hasattr(value, 'read') else bytes(value)
-                
-                pg_row[col_name] = value
+    plan = []
+    for pg_col in pg_schema["columns"]:
+        oracle_col = name_map.get(pg_col["column_name"])
+        if oracle_col is not None:
+            plan.append((pg_col["column_name"], oracle_col, pick_converter(type_map[oracle_col])))
+    return plan
+
+def transform_oracle_to_postgres_data(
+    oracle_data: List[tuple], 
+    converters: List[Optional[Callable[[Any], Any]]]
+) -> Iterator[tuple]:
+    """Transform Oracle rows to fit the PostgreSQL schema, lazily, with one converter per column"""
+    return compile_row_converter(tuple(converters))(oracle_data)
+
+@functools.lru_cache(maxsize=256)
+def compile_row_converter(
+    converters: Tuple[Optional[Callable[[Any], Any]], ...]
+) -> Callable[[List[tuple]], Iterator[tuple]]:
+    """Generate a function converting rows for a sequence of column converters, dropping any trailing ROWID"""
+    namespace = {}
+    if all(convert is None for convert in converters):
+        row_expr = f"r[:{len(converters)}]"
+    else:
+        values = []
+        for i, convert in enumerate(converters):
+            if convert is None:
+                values.append(f"r[{i}]")
+            else:
+                namespace[f"_convert_{i}"] = convert
+                values.append(f"_convert_{i}(r[{i}])")
+        row_expr = f"({', '.join(values)},)"
         
-        result.append(pg_row)
-    
-    return result
+    source = f"def convert_rows(rows):\n    return ({row_expr} for r in rows)\n"
+    exec(compile(source, "<row converter>", "exec"), namespace)
+    return namespace["convert_rows"]
+
+def pick_converter(oracle_type: str) -> Optional[Callable[[Any], Any]]:
+    """Return the value converter for an Oracle type, or None if values pass through"""
+    if oracle_type == "CLOB":
+        return _clob_to_text
+    if oracle_type == "BLOB":
+        return _blob_to_bytes
+    return None
+
+def _clob_to_text(value: Any) -> Optional[str]:
+    """Convert CLOB to text"""
+    if value is None:
+        return None
+    return str(value.read()) if hasattr(value, 'read') else str(value)
+
+def _blob_to_bytes(value: Any) -> Optional[bytes]:
+    """Convert BLOB to bytea"""
+    if value is None:
+        return None
+    return bytes(value.read()) if hasattr(value, 'read') else bytes(value)
 
 def get_oracle_table_row_count(oracle, table_name: str) -> int:
-    """Get the number of rows in an Oracle table"""
+    """Get the estimated number of rows from optimizer statistics, or -1 if the table was never analyzed"""
     cursor = oracle.connection.cursor()
     try:
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        return cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT NVL(num_rows, -1)
+            FROM all_tables
+            WHERE owner = :owner AND table_name = :table_name
+        """, owner=oracle.connection_params["user"].upper(), table_name=table_name.upper())
+        row = cursor.fetchone()
+        return row[0] if row else -1
     finally:
         cursor.close()
 
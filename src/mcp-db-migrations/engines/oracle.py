@@ -1,11 +1,21 @@
 # src/mcp-db-migrations/engines/oracle.py
 
 import logging
-import cx_Oracle
-from typing import List, Dict, Any, Optional
+import sys
+import oracledb
+from typing import List, Dict, Any, Optional, Tuple, Generator
 
 logger = logging.getLogger("db_migration.oracle")
 
+# Fixed, locale-independent conversions for every migration session
+SESSION_SETTINGS = """
+    ALTER SESSION SET
+        NLS_DATE_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS'
+        NLS_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.FF6'
+        NLS_NUMERIC_CHARACTERS = '.,'
+        TIME_ZONE = '+00:00'
+"""
+
 class OracleConnector:
     def __init__(
         self,
@@ -15,6 +25,7 @@ class OracleConnector:
         password: str,
         service_name: str,
         wallet_location: Optional[str] = None,
+        pool: Optional[oracledb.ConnectionPool] = None,
     ):
         self.connection_params = {
             "user": username,
@@ -25,12 +36,19 @@ class OracleConnector:
         if wallet_location:
             self.connection_params["wallet_location"] = wallet_location
             
+        self.pool = pool
         self.connection = None
+        # Owner-wide column, key and dependency metadata, loaded on first use
+        self._schema_metadata = None
         
     def connect(self):
         """Establish a connection to the Oracle database"""
         try:
-            self.connection = cx_Oracle.connect(**self.connection_params)
+            if self.pool is not None:
+                self.connection = self.pool.acquire()
+            else:
+                self.connection = oracledb.connect(**self.connection_params)
+                _configure_session(self.connection)
             logger.info(f"Connected to Oracle database at {self.connection_params['dsn']}")
             return True
         except Exception as e:
@@ -40,7 +58,10 @@ class OracleConnector:
     def disconnect(self):
         """Close the database connection"""
         if self.connection:
-            self.connection.close()
+            if self.pool is not None:
+                self.pool.release(self.connection)
+            else:
+                self.connection.close()
             self.connection = None
             
     def get_tables(self) -> List[str]:
@@ -57,84 +78,235 @@ class OracleConnector:
             
     def get_schema(self, table_name: str) -> Dict[str, Any]:
         """Get schema definition for a specific table"""
+        columns, primary_keys, procedures = self._get_schema_metadata()
+        table_key = table_name.upper()
+        
+        return {
+            "table_name": table_name,
+            "columns": columns.get(table_key, []),
+            "primary_keys": primary_keys.get(table_key, []),
+            "procedures": procedures.get(table_key, []),
+            "original_db_type": "ORACLE"
+        }
+        
+    def _get_schema_metadata(self) -> Tuple[Dict[str, list], Dict[str, list], Dict[str, list]]:
+        """Load column, primary key and dependency metadata for all of the owner's tables in three queries"""
+        if self._schema_metadata is not None:
+            return self._schema_metadata
+            
+        owner = self.connection_params["user"].upper()
         cursor = self.connection.cursor()
         try:
             # Get column information
             cursor.execute("""
-                SELECT column_name, data_type, data_length, nullable, data_default
+                SELECT table_name, column_name, data_type, data_length,
+                       data_precision, data_scale, nullable, data_default
                 FROM all_tab_columns
-                WHERE table_name = :table_name AND owner = :owner
-                ORDER BY column_id
-            """, table_name=table_name.upper(), owner=self.connection_params["user"].upper())
-            
-            columns = []
-            for row in cursor.fetchall():
-                columns.append({
-                    "column_name": row[0],
-                    "data_type": row[1],
-                    "data_length": row[2],
-                    "nullable": row[3],
-                    "default_value": row[4]
+                WHERE owner = :owner
+                ORDER BY table_name, column_id
+            """, owner=owner)
+            
+            columns = {}
+            for row in cursor:
+                columns.setdefault(row[0], []).append({
+                    "column_name": row[1],
+                    "data_type": row[2],
+                    "data_length": row[3],
+                    "data_precision": row[4],
+                    "data_scale": row[5],
+                    "nullable": row[6],
+                    "default_value": row[7]
                 })
             
             # Get primary key information
             cursor.execute("""
-                SELECT cols.column_name
+                SELECT cons.table_name, cols.column_name
                 FROM all_constraints cons, all_cons_columns cols
                 WHERE cons.constraint_type = 'P'
                 AND cons.constraint_name = cols.constraint_name
                 AND cons.owner = cols.owner
-                AND cons.table_name = :table_name
                 AND cons.owner = :owner
-            """, table_name=table_name.upper(), owner=self.connection_params["user"].upper())
+                ORDER BY cons.table_name, cols.position
+            """, owner=owner)
             
-            primary_keys = [row[0] for row in cursor.fetchall()]
+            primary_keys = {}
+            for row in cursor:
+                primary_keys.setdefault(row[0], []).append(row[1])
             
-            # Get stored procedures for this table
+            # Get stored procedures, triggers etc. that reference each table
             cursor.execute("""
-                SELECT name, type 
-                FROM all_source 
-                WHERE name LIKE :table_pattern 
+                SELECT referenced_name, name, type
+                FROM all_dependencies
+                WHERE referenced_owner = :owner
                 AND owner = :owner
-                GROUP BY name, type
-            """, table_pattern=f"%{table_name.upper()}%", owner=self.connection_params["user"].upper())
-            
-            procedures = [{"name": row[0], "type": row[1]} for row in cursor.fetchall()]
-            
-            return {
-                "table_name": table_name,
-                "columns": columns,
-                "primary_keys": primary_keys,
-                "procedures": procedures,
-                "original_db_type": "ORACLE"
-            }
+                AND referenced_type = 'TABLE'
+            """, owner=owner)
+            
+            procedures = {}
+            for row in cursor:
+                procedures.setdefault(row[0], []).append({"name": row[1], "type": row[2]})
+            
+            self._schema_metadata = (columns, primary_keys, procedures)
+            return self._schema_metadata
         finally:
             cursor.close()
     
-    def fetch_data(self, table_name: str, batch_size: int, offset: int = 0) -> List[Dict[str, Any]]:
-        """Fetch a batch of data from the table"""
+    def get_key_bounds(self, table_name: str, key_column: str) -> Tuple[Any, Any]:
+        """Get the minimum and maximum value of a key column"""
         cursor = self.connection.cursor()
         try:
-            # Get column names first
-            cursor.execute(f"SELECT * FROM {table_name} WHERE ROWNUM = 1")
-            column_names = [d[0] for d in cursor.description]
+            key = _quote(key_column)
+            cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table_name}")
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            
+    def fetch_data(
+        self,
+        table_name: str,
+        batch_size: int,
+        last_key: Any = None,
+        key_column: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        max_bytes: Optional[int] = None
+    ) -> Tuple[List[tuple], Any]:
+        """
+        Fetch the batch of rows after last_key, ordered by key_column or else by ROWID
+        (appended to each row); returns the rows and the key to pass as the next last_key
+        """
+        cursor = self.connection.cursor()
+        try:
+            # Pull the whole batch in a single round trip (the default arraysize is 100)
+            cursor.arraysize = batch_size
+            cursor.prefetchrows = batch_size + 1
+            # Fetch LOBs inline instead of one round trip per locator read
+            cursor.outputtypehandler = _inline_lob_handler
             
-            # Fetch batch of data with ROWNUM-based pagination
+            select_list = ", ".join(f"t.{_quote(col)}" for col in columns) if columns else "t.*"
+            if key_column:
+                key_expr = f"t.{_quote(key_column)}"
+                key_filter = f"{key_expr} > :last_key"
+            else:
+                key_expr = "t.ROWID"
+                select_list += ", ROWIDTOCHAR(t.ROWID) AS migration_rowid"
+                key_filter = f"{key_expr} > CHARTOROWID(:last_key)"
+                key_column = "MIGRATION_ROWID"
+                
+            params = {"batch_size": batch_size}
+            conditions = []
+            if last_key is not None:
+                conditions.append(key_filter)
+                params["last_key"] = last_key
+            if key_range is not None:
+                conditions.append(f"{key_expr} >= :range_start AND {key_expr} < :range_end")
+                params["range_start"], params["range_end"] = key_range
+            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                
             cursor.execute(f"""
-                SELECT * FROM (
-                    SELECT a.*, ROWNUM rnum FROM (
-                        SELECT * FROM {table_name} ORDER BY 1
-                    ) a WHERE ROWNUM <= :end_row
-                ) WHERE rnum > :start_row
-            """, end_row=offset+batch_size, start_row=offset)
-            
-            results = []
-            for row in cursor.fetchall():
-                row_data = {}
-                for i, col_name in enumerate(column_names):
-                    row_data[col_name] = row[i]
-                results.append(row_data)
+                SELECT {select_list} FROM {table_name} t
+                {where_clause}
+                ORDER BY {key_expr}
+                FETCH FIRST :batch_size ROWS ONLY
+            """, params)
+            
+            if max_bytes is None:
+                rows = cursor.fetchall()
+            else:
+                rows = []
+                batch_bytes = 0
+                for row in cursor:
+                    rows.append(row)
+                    batch_bytes += estimate_row_size(row)
+                    if batch_bytes >= max_bytes:
+                        break
+                        
+            if not rows:
+                return [], last_key
                 
-            return results
+            # Column names come from the batch query itself, no separate describe
+            key_index = [d[0] for d in cursor.description].index(key_column)
+            return rows, rows[-1][key_index]
         finally:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+            
+    def fetch_arrow_batches(
+        self,
+        table_name: str,
+        batch_size: int,
+        columns: Optional[List[str]] = None,
+        key_column: Optional[str] = None,
+        key_range: Optional[Tuple[Any, Any]] = None
+    ) -> Generator[Any, None, None]:
+        """Stream the table as pyarrow Tables of up to batch_size rows using the DataFrame fetch"""
+        import pyarrow
+        
+        select_list = ", ".join(f"t.{_quote(col)}" for col in columns) if columns else "t.*"
+        statement = f"SELECT {select_list} FROM {table_name} t"
+        params = {}
+        if key_range is not None:
+            key_expr = f"t.{_quote(key_column)}"
+            statement += f" WHERE {key_expr} >= :range_start AND {key_expr} < :range_end"
+            params["range_start"], params["range_end"] = key_range
+            
+        # Without fetch_decimals, NUMBER columns wider than 15 digits arrive as
+        # float64 and lose their low digits
+        for data_frame in self.connection.fetch_df_batches(
+            statement, params, size=batch_size, fetch_decimals=True
+        ):
+            yield pyarrow.table(data_frame)
+
+
+def _quote(column_name: str) -> str:
+    """Quote a column name from the data dictionary, keeping its case and allowing reserved words"""
+    return f'"{column_name}"'
+
+
+def estimate_row_size(row: tuple) -> int:
+    """Rough in-memory size of a fetched row, in bytes"""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+# LOB types and the LONG types that fetch their contents inline
+_INLINE_LOB_TYPES = {
+    oracledb.DB_TYPE_CLOB: oracledb.DB_TYPE_LONG,
+    oracledb.DB_TYPE_NCLOB: oracledb.DB_TYPE_LONG_NVARCHAR,
+    oracledb.DB_TYPE_BLOB: oracledb.DB_TYPE_LONG_RAW,
+}
+
+
+def _inline_lob_handler(cursor, metadata):
+    """Output type handler returning CLOB/BLOB values as str/bytes"""
+    inline_type = _INLINE_LOB_TYPES.get(metadata.type_code)
+    if inline_type is not None:
+        return cursor.var(inline_type, arraysize=cursor.arraysize)
+
+
+def _configure_session(connection: oracledb.Connection, requested_tag: Optional[str] = None):
+    """Apply SESSION_SETTINGS; also used as the pool's session callback"""
+    with connection.cursor() as cursor:
+        cursor.execute(SESSION_SETTINGS)
+
+
+def create_pool(
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    service_name: str,
+    min_size: int = 1,
+    max_size: int = 4,
+    wallet_location: Optional[str] = None
+) -> oracledb.ConnectionPool:
+    """Create a pool of Oracle sessions for the workers of a migration"""
+    params = OracleConnector(host, port, username, password, service_name, wallet_location).connection_params
+    # The callback runs once per new session, not on every acquire
+    pool = oracledb.create_pool(
+        **params,
+        min=min_size,
+        max=max_size,
+        increment=1,
+        session_callback=_configure_session
+    )
+    logger.info(f"Opened Oracle session pool for {params['dsn']}")
+    return pool
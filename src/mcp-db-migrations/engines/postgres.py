@@ -1,11 +1,29 @@
 # src/db-migration/engines/postgres.py
 import logging
-import psycopg2
-from psycopg2.extras import DictCursor
-from typing import List, Dict, Any, Optional
+import re
+import threading
+from urllib.parse import quote, urlencode
+import psycopg
+from psycopg import errors, sql
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from typing import List, Dict, Any, Optional, Iterable, Tuple
 
 logger = logging.getLogger("db-migration.postgres")
 
+# PostgreSQL caps a statement at 65535 bind parameters
+MAX_BIND_PARAMS = 65535
+
+# Rows per multi-row INSERT when COPY is not available
+INSERT_PAGE_SIZE = 1000
+
+# Sort memory for building primary keys after a bulk load, split between
+# the tables finalized at once
+MAINTENANCE_WORK_MEM_MB = 1024
+
+# Never give a primary key build less than PostgreSQL's default
+MIN_MAINTENANCE_WORK_MEM_MB = 64
+
 class PostgresConnector:
     def __init__(
         self,
@@ -14,7 +32,9 @@ class PostgresConnector:
         username: str,
         password: str,
         database: str,
-        ssl_mode: Optional[str] = None
+        ssl_mode: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        adbc_connections: Optional["AdbcConnections"] = None
     ):
         self.connection_params = {
             "host": host,
@@ -22,17 +42,32 @@ class PostgresConnector:
             "user": username,
             "password": password,
             "dbname": database,
+            "connect_timeout": 10,
+            # The source database stays authoritative until the migration is
+            # done, so skip waiting for the WAL flush on each commit
+            "options": "-c synchronous_commit=off",
         }
         
         if ssl_mode:
             self.connection_params["sslmode"] = ssl_mode
             
+        self.pool = pool
+        self.adbc_connections = adbc_connections
         self.connection = None
+        self._cursor = None
+        self._adbc_connection = None
+        # Whether this role may COPY; None until the first attempt
+        self._copy_allowed = None
+        # Composed COPY/INSERT statements, reused across batches
+        self._statements: Dict[Tuple, sql.Composed] = {}
         
     def connect(self):
         """Establish a connection to the PostgreSQL database"""
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            if self.pool is not None:
+                self.connection = self.pool.getconn()
+            else:
+                self.connection = psycopg.connect(**self.connection_params, autocommit=False)
             logger.info(f"Connected to PostgreSQL database at {self.connection_params['host']}")
             return True
         except Exception as e:
@@ -41,8 +76,22 @@ class PostgresConnector:
             
     def disconnect(self):
         """Close the database connection"""
+        if self._cursor:
+            self._cursor.close()
+            self._cursor = None
+        if self._adbc_connection:
+            if self.adbc_connections is not None:
+                # Leave the shared connection without an open transaction
+                self.adbc_connections.release(self._adbc_connection)
+            else:
+                self._adbc_connection.close()
+            self._adbc_connection = None
         if self.connection:
-            self.connection.close()
+            if self.pool is not None:
+                # Hand the connection back instead of tearing down the session
+                self.pool.putconn(self.connection)
+            else:
+                self.connection.close()
             self.connection = None
             
     def get_tables(self) -> List[str]:
@@ -55,7 +104,7 @@ class PostgresConnector:
             
     def get_schema(self, table_name: str) -> Dict[str, Any]:
         """Get schema definition for a specific table"""
-        with self.connection.cursor(cursor_factory=DictCursor) as cursor:
+        with self.connection.cursor(row_factory=dict_row) as cursor:
             # Get column information
             cursor.execute("""
                 SELECT column_name, data_type, is_nullable, column_default
@@ -74,69 +123,379 @@ class PostgresConnector:
                     AND tc.table_name = c.table_name AND ccu.column_name = c.column_name
                 WHERE constraint_type = 'PRIMARY KEY' AND tc.table_name = %s
             """, (table_name,))
-            primary_keys = [row[0] for row in cursor.fetchall()]
+            primary_keys = [row["column_name"] for row in cursor.fetchall()]
             
             return {
                 "table_name": table_name,
-                "columns": [dict(col) for col in columns],
+                "columns": columns,
                 "primary_keys": primary_keys
             }
             
     def create_table_from_schema(self, schema: Dict[str, Any]) -> bool:
         """Create a table based on schema definition"""
-        table_name = schema["table_name"]
-        columns = schema["columns"]
-        primary_keys = schema["primary_keys"]
+        return self.create_tables_from_schemas([schema])
         
-        # Build CREATE TABLE statement
-        column_defs = []
-        for col in columns:
-            nullable = "NULL" if col["is_nullable"] == "YES" else "NOT NULL"
-            default = f"DEFAULT {col['column_default']}" if col["column_default"] else ""
-            column_defs.append(f"{col['column_name']} {col['data_type']} {nullable} {default}".strip())
-            
-        if primary_keys:
-            column_defs.append(f"PRIMARY KEY ({', '.join(primary_keys)})")
+    def create_tables_from_schemas(self, schemas: List[Dict[str, Any]], bulk_load: bool = False) -> bool:
+        """Create several tables in one pipelined round trip; bulk_load makes them UNLOGGED without primary keys"""
+        table_names = [schema["table_name"] for schema in schemas]
+        
+        try:
+            with self.connection.pipeline():
+                with self.connection.cursor() as cursor:
+                    for schema in schemas:
+                        # One-shot DDL: don't spend a round trip preparing it
+                        cursor.execute(_create_table_stmt(schema, bulk_load), prepare=False)
+            self.connection.commit()
+            logger.info(f"Created tables {', '.join(table_names)}")
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Failed to create tables {', '.join(table_names)}: {str(e)}")
+            raise
             
-        create_stmt = f"CREATE TABLE IF NOT EXISTS {table_name} (\n  " + ",\n  ".join(column_defs) + "\n)"
+    def finalize_table(self, schema: Dict[str, Any], concurrency: int = 1) -> bool:
+        """Make a bulk-loaded table logged and build its primary key, sharing sort memory with `concurrency` tables"""
+        table_name = schema["table_name"]
+        table = sql.Identifier(table_name)
+        work_mem = max(MIN_MAINTENANCE_WORK_MEM_MB, MAINTENANCE_WORK_MEM_MB // concurrency)
         
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute(create_stmt)
+                # The table may have existed before the migration, keys and all
+                cursor.execute(
+                    "SELECT EXISTS (SELECT 1 FROM pg_constraint "
+                    "WHERE conrelid = to_regclass(quote_ident(%s)) AND contype = 'p')",
+                    (table_name,)
+                )
+                has_primary_key = cursor.fetchone()[0]
+                
+                with self.connection.pipeline():
+                    cursor.execute(
+                        sql.SQL("SET LOCAL maintenance_work_mem = {}").format(sql.Literal(f"{work_mem}MB")),
+                        prepare=False
+                    )
+                    cursor.execute(sql.SQL("ALTER TABLE {} SET LOGGED").format(table), prepare=False)
+                    if schema["primary_keys"] and not has_primary_key:
+                        cursor.execute(
+                            sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(
+                                table, sql.SQL(", ").join(map(sql.Identifier, schema["primary_keys"]))
+                            ),
+                            prepare=False
+                        )
             self.connection.commit()
-            logger.info(f"Created table {table_name}")
+            logger.info(f"Finalized table {table_name}")
             return True
         except Exception as e:
             self.connection.rollback()
-            logger.error(f"Failed to create table {table_name}: {str(e)}")
+            logger.error(f"Failed to finalize table {table_name}: {str(e)}")
             raise
             
     def fetch_data(self, table_name: str, batch_size: int, offset: int = 0) -> List[Dict[str, Any]]:
         """Fetch a batch of data from the table"""
-        with self.connection.cursor(cursor_factory=DictCursor) as cursor:
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT %s OFFSET %s", (batch_size, offset))
-            return [dict(row) for row in cursor.fetchall()]
+        with self.connection.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(
+                sql.SQL("SELECT * FROM {} LIMIT %s OFFSET %s").format(sql.Identifier(table_name)),
+                (batch_size, offset)
+            )
+            return cursor.fetchall()
             
-    def insert_data(self, table_name: str, data: List[Dict[str, Any]]) -> int:
-        """Insert a batch of data into the table"""
-        if not data:
+    def insert_data(
+        self,
+        table_name: str,
+        columns: List[str],
+        rows: Iterable[tuple],
+        commit: bool = True
+    ) -> int:
+        """Insert rows (tuples in `columns` order) with COPY, or multi-row INSERTs if COPY is not permitted"""
+        try:
+            cursor = self._get_cursor()
+            if self._copy_allowed is not False:
+                # Probe under a savepoint so a refusal keeps earlier uncommitted batches
+                probe = self._copy_allowed is None
+                if probe:
+                    cursor.execute("SAVEPOINT copy_probe")
+                try:
+                    row_count = 0
+                    with cursor.copy(self._copy_stmt(table_name, columns)) as copy:
+                        for row in rows:
+                            copy.write_row(row)
+                            row_count += 1
+                    self._copy_allowed = True
+                except errors.InsufficientPrivilege:
+                    if not probe:
+                        raise
+                    cursor.execute("ROLLBACK TO SAVEPOINT copy_probe")
+                    self._copy_allowed = False
+                    logger.warning(f"COPY not permitted on {table_name}, falling back to INSERT")
+                    
+            if self._copy_allowed is False:
+                # COPY is refused before any row is consumed, so `rows` is still intact
+                row_count = self._insert_pages(cursor, table_name, columns, list(rows))
+                
+            if commit:
+                self.connection.commit()
+            return row_count
+        except Exception as e:
+            self.rollback()
+            logger.error(f"Failed to insert data into {table_name}: {str(e)}")
+            raise
+            
+    def _insert_pages(
+        self,
+        cursor: psycopg.Cursor,
+        table_name: str,
+        columns: List[str],
+        values: List[tuple]
+    ) -> int:
+        """Insert rows with one multi-row INSERT statement per page"""
+        page_size = max(1, min(INSERT_PAGE_SIZE, MAX_BIND_PARAMS // len(columns)))
+        
+        for start in range(0, len(values), page_size):
+            page = values[start:start + page_size]
+            # Full pages share one server-side prepared statement
+            cursor.execute(
+                self._insert_stmt(table_name, columns, len(page)),
+                [value for row in page for value in row],
+                prepare=len(page) == page_size
+            )
+        return len(values)
+        
+    def _copy_stmt(self, table_name: str, columns: List[str]) -> sql.Composed:
+        """COPY ... FROM STDIN statement for a table and column list"""
+        key = ("copy", table_name, tuple(columns))
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+                table=sql.Identifier(table_name),
+                columns=sql.SQL(", ").join(map(sql.Identifier, columns))
+            )
+        return statement
+        
+    def _insert_stmt(self, table_name: str, columns: List[str], row_count: int) -> sql.Composed:
+        """Multi-row INSERT statement for a table, column list and number of rows"""
+        key = ("insert", table_name, tuple(columns), row_count)
+        statement = self._statements.get(key)
+        if statement is None:
+            row = sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(columns)))
+            statement = self._statements[key] = sql.SQL("INSERT INTO {table} ({columns}) VALUES {rows}").format(
+                table=sql.Identifier(table_name),
+                columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+                rows=sql.SQL(", ").join([row] * row_count)
+            )
+        return statement
+        
+    def ingest_arrow(self, table_name: str, data: Any, commit: bool = True) -> int:
+        """Append an Arrow table with the ADBC driver's binary COPY"""
+        if data.num_rows == 0:
             return 0
             
-        # Get column names from the first row
-        columns = list(data[0].keys())
-        placeholders = ", ".join(["%s"] * len(columns))
-        column_str = ", ".join(columns)
+        connection = self._get_adbc_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.adbc_ingest(table_name, data, mode="append")
+            if commit:
+                connection.commit()
+            return data.num_rows
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to ingest Arrow data into {table_name}: {str(e)}")
+            raise
+            
+    def commit(self):
+        """Commit the open transaction, including any Arrow ingestion"""
+        self.connection.commit()
+        if self._adbc_connection:
+            self._adbc_connection.commit()
+            
+    def rollback(self):
+        """Roll back the open transaction, including any Arrow ingestion"""
+        self.connection.rollback()
+        if self._adbc_connection:
+            self._adbc_connection.rollback()
+            
+    def _get_adbc_connection(self):
+        """Open (once) the ADBC connection used for Arrow ingestion, or borrow this thread's shared one"""
+        if self._adbc_connection is None:
+            if self.adbc_connections is not None:
+                self._adbc_connection = self.adbc_connections.get(self.connection_params)
+            else:
+                self._adbc_connection = _connect_adbc(self.connection_params)
+        return self._adbc_connection
+        
+    def _get_cursor(self) -> psycopg.Cursor:
+        """Return a cursor that is reused across batches"""
+        if self._cursor is None or self._cursor.closed:
+            self._cursor = self.connection.cursor()
+        return self._cursor
+
+
+class AdbcConnections:
+    """ADBC connections for Arrow ingestion, one per worker thread, reused across tables"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
         
-        insert_stmt = f"INSERT INTO {table_name} ({column_str}) VALUES ({placeholders})"
+    def get(self, connection_params: Dict[str, Any]) -> Any:
+        """Return the calling thread's connection, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = _connect_adbc(connection_params)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
         
+    def release(self, connection: Any):
+        """Roll back what a connector left uncommitted; drop the connection if that fails"""
         try:
-            with self.connection.cursor() as cursor:
-                # Convert list of dicts to list of tuples in the correct order
-                values = [[row[col] for col in columns] for row in data]
-                cursor.executemany(insert_stmt, values)
-            self.connection.commit()
-            return len(data)
+            connection.rollback()
         except Exception as e:
-            self.connection.rollback()
-            logger.error(f"Failed to insert data into {table_name}: {str(e)}")
-            raise
\ No newline at end of file
+            logger.warning(f"Discarding ADBC connection: {str(e)}")
+            self._local.connection = None
+            with self._lock:
+                self._connections.remove(connection)
+            connection.close()
+            
+    def close(self):
+        """Close every connection opened by any thread"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+
+def _connect_adbc(params: Dict[str, Any]) -> Any:
+    """Open an ADBC connection; requires adbc-driver-postgresql"""
+    import adbc_driver_postgresql.dbapi
+    return adbc_driver_postgresql.dbapi.connect(_adbc_uri(params))
+
+
+def _adbc_uri(params: Dict[str, Any]) -> str:
+    """libpq connection URI for a connector's connection parameters"""
+    uri = (
+        f"postgresql://{quote(params['user'], safe='')}:{quote(params['password'], safe='')}"
+        f"@{params['host']}:{params['port']}/{quote(params['dbname'], safe='')}"
+    )
+    query = {"options": params["options"]}
+    if "sslmode" in params:
+        query["sslmode"] = params["sslmode"]
+    # libpq decodes %XX but not '+', so spaces must be percent-encoded
+    return f"{uri}?{urlencode(query, quote_via=quote)}"
+
+
+def create_pool(
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    database: str,
+    ssl_mode: Optional[str] = None,
+    min_size: int = 4,
+    max_size: int = 20,
+    timeout: float = 60
+) -> ConnectionPool:
+    """Create a pool of PostgreSQL connections shared across migrations"""
+    params = PostgresConnector(host, port, username, password, database, ssl_mode).connection_params
+    pool = ConnectionPool(
+        kwargs={**params, "autocommit": False},
+        min_size=min(min_size, max_size),
+        max_size=max_size,
+        timeout=timeout,
+        open=True
+    )
+    logger.info(f"Opened PostgreSQL connection pool for {host}")
+    return pool
+
+
+def arrow_schema(schema: Dict[str, Any], columns: List[str]) -> Optional[Any]:
+    """Arrow types to cast `columns` to before ingest_arrow(), or None if one has no equivalent"""
+    import pyarrow
+    
+    types = {col["column_name"]: col["data_type"] for col in schema["columns"]}
+    fields = []
+    for name in columns:
+        arrow_type = _arrow_type(pyarrow, types[name])
+        if arrow_type is None:
+            return None
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
+
+
+def cast_to_arrow_schema(data: Any, schema: Any) -> Any:
+    """Cast an Arrow table's columns, by position, to an arrow_schema() schema; lossy values raise"""
+    import pyarrow
+    import pyarrow.compute
+    
+    columns = []
+    for column, field in zip(data.columns, schema):
+        if pyarrow.types.is_integer(column.type) and pyarrow.types.is_decimal(field.type):
+            # Integer to decimal casts are checked against the integer type's
+            # range, not the values; going through the widest decimal checks the values
+            column = pyarrow.compute.cast(column, pyarrow.decimal128(38, 0))
+        elif (
+            pyarrow.types.is_floating(column.type)
+            and pyarrow.types.is_decimal(field.type)
+            and field.type.precision > 15
+        ):
+            # float64 keeps only 15 significant digits, the rest would be silently rounded
+            raise pyarrow.ArrowInvalid(
+                f"Column {field.name} arrived as {column.type}, too imprecise for {field.type}"
+            )
+        columns.append(pyarrow.compute.cast(column, field.type))
+    return pyarrow.Table.from_arrays(columns, schema=schema)
+
+
+def _arrow_type(pyarrow, data_type: str) -> Optional[Any]:
+    """The Arrow type ADBC writes in a column's binary format, or None if there is none"""
+    match = re.fullmatch(r"([A-Z ]+?)\s*(?:\((\d+)(?:,\s*(-?\d+))?\))?", data_type.strip().upper())
+    if match is None:
+        return None
+    name, precision, scale = match.groups()
+    
+    if name in ("NUMERIC", "DECIMAL"):
+        # Unconstrained NUMERIC (Oracle's bare NUMBER) has no fixed decimal type
+        if precision is None:
+            return None
+        precision, scale = int(precision), int(scale or 0)
+        if not 0 <= scale <= precision <= 38:
+            return None
+        return pyarrow.decimal128(precision, scale)
+    if name in ("VARCHAR", "CHARACTER VARYING", "CHAR", "CHARACTER", "TEXT"):
+        return pyarrow.string()
+    if name in ("TIMESTAMP", "TIMESTAMP WITHOUT TIME ZONE"):
+        return pyarrow.timestamp("us")
+    if name in ("DOUBLE PRECISION", "FLOAT8"):
+        return pyarrow.float64()
+    if name == "BYTEA":
+        return pyarrow.binary()
+    return None
+
+
+def _create_table_stmt(schema: Dict[str, Any], bulk_load: bool = False) -> sql.Composed:
+    """Build the CREATE TABLE statement for a schema definition"""
+    column_defs = []
+    for col in schema["columns"]:
+        # Converted schemas carry a boolean, introspected ones information_schema's YES/NO
+        is_nullable = col["nullable"] if "nullable" in col else col["is_nullable"] == "YES"
+        parts = [
+            sql.Identifier(col["column_name"]),
+            # Types and defaults are SQL expressions, not identifiers
+            sql.SQL(col["data_type"]),
+            sql.SQL("NULL" if is_nullable else "NOT NULL")
+        ]
+        if col["column_default"]:
+            parts.append(sql.SQL("DEFAULT {}").format(sql.SQL(col["column_default"])))
+        column_defs.append(sql.SQL(" ").join(parts))
+        
+    if schema["primary_keys"] and not bulk_load:
+        column_defs.append(sql.SQL("PRIMARY KEY ({})").format(
+            sql.SQL(", ").join(map(sql.Identifier, schema["primary_keys"]))
+        ))
+        
+    return sql.SQL("CREATE {}TABLE IF NOT EXISTS {} (\n  {}\n)").format(
+        sql.SQL("UNLOGGED " if bulk_load else ""),
+        sql.Identifier(schema["table_name"]),
+        sql.SQL(",\n  ").join(column_defs)
+    )
@@ -0,0 +1,95 @@
+# src/mcp-db-migrations/migrations/manager.py
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger("db-migration.manager")
+
+class MigrationStore:
+    """SQLite-backed record of migrations and their progress"""
+
+    def __init__(self, path: str = "migrations.db"):
+        # Autocommit; the background workers and request handlers share the connection
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS migrations (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                request JSON,
+                details JSON,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._lock = threading.Lock()
+        logger.info(f"Opened migration store at {path}")
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self.connection.close()
+
+    def create(self, migration_id: str, request: Dict[str, Any]):
+        """Record a new pending migration"""
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO migrations (id, status, request, details, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (migration_id, "pending", json.dumps(request), None, now, now)
+            )
+
+    def update(
+        self,
+        migration_id: str,
+        status: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        """Update the status and/or details of a migration"""
+        assignments = ["updated = ?"]
+        params = [time.time()]
+        if status is not None:
+            assignments.append("status = ?")
+            params.append(status)
+        if details is not None:
+            assignments.append("details = ?")
+            params.append(json.dumps(details, default=str))
+        params.append(migration_id)
+
+        with self._lock:
+            self.connection.execute(
+                f"UPDATE migrations SET {', '.join(assignments)} WHERE id = ?", params
+            )
+
+    def get(self, migration_id: str) -> Optional[Dict[str, Any]]:
+        """Get a migration by id, or None if it does not exist"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT id, status, request, details, created FROM migrations WHERE id = ?",
+                (migration_id,)
+            ).fetchone()
+        return _to_record(row) if row else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """List all migrations, oldest first"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, status, request, details, created FROM migrations ORDER BY created"
+            ).fetchall()
+        return [_to_record(row) for row in rows]
+
+
+def _to_record(row: tuple) -> Dict[str, Any]:
+    """Decode a migrations row"""
+    return {
+        "id": row[0],
+        "status": row[1],
+        "request": json.loads(row[2]) if row[2] else None,
+        "details": json.loads(row[3]) if row[3] else None,
+        "created": row[4]
+    }
@@ -0,0 +1,6 @@
+# src/mcp-db-migrations/tests/conftest.py
+
+import os
+
+# api opens its migration store on import; keep it out of the working directory
+os.environ.setdefault("MIGRATIONS_DB", ":memory:")
@@ -0,0 +1,254 @@
+# src/mcp-db-migrations/tests/test_api.py
+
+import asyncio
+import io
+import json
+from collections import deque
+
+import pytest
+from fastapi import BackgroundTasks
+from pydantic import ValidationError
+
+from api import (
+    MAX_PARALLELISM,
+    SHARD_MIN_ROWS,
+    ArrowTransferRejected,
+    DatabaseConfig,
+    DataTransfer,
+    MigrationRecord,
+    MigrationRequest,
+    _blob_to_bytes,
+    _notify_progress,
+    _clob_to_text,
+    compile_row_converter,
+    copy_table_batches,
+    create_migration,
+    iter_oracle_batches,
+    migration_events,
+    plan_key_ranges,
+    store,
+    transform_oracle_to_postgres_data,
+    tune_batch_rows,
+)
+from engines.oracle import estimate_row_size
+
+
+def make_transfer(**request_fields) -> DataTransfer:
+    request = MigrationRequest(
+        source_db=DatabaseConfig(db_type="oracle", database_name="ORCL"),
+        target_db=DatabaseConfig(db_type="postgres", database_name="target"),
+        **request_fields
+    )
+    stats = {"rows_migrated": 0}
+    transfer = DataTransfer(MigrationRecord("test"), request, None, None, stats, deque())
+    transfer.add_table("PATIENTS", 0)
+    return transfer
+
+
+class FailingArrowOracle:
+    """Oracle connector whose DataFrame fetch fails before the first batch"""
+
+    def fetch_arrow_batches(self, *args):
+        raise RuntimeError("DPY-3030: unsupported column type")
+        yield
+
+
+def test_arrow_fetch_failure_before_first_batch_rejects_arrow_transfer():
+    pyarrow = pytest.importorskip("pyarrow")
+
+    with pytest.raises(ArrowTransferRejected, match="DPY-3030"):
+        copy_table_batches(
+            make_transfer(),
+            FailingArrowOracle(),
+            None,
+            "PATIENTS",
+            {"primary_keys": ["ID"]},
+            {"table_name": "patients"},
+            [("id", "ID", None)],
+            None,
+            arrow_schema=pyarrow.schema([("id", pyarrow.decimal128(10, 0))])
+        )
+
+
+@pytest.mark.parametrize("field, value", [
+    ("parallelism", 0),
+    ("parallelism", MAX_PARALLELISM + 1),
+    ("batch_size", 0),
+    ("batch_bytes", 0),
+])
+def test_migration_request_rejects_out_of_range_settings(field, value):
+    with pytest.raises(ValidationError):
+        make_transfer(**{field: value})
+
+
+def test_row_converter_applies_converters_by_position():
+    convert_rows = compile_row_converter((None, str.upper, None, len))
+
+    assert list(convert_rows([(1, "ward", 2.5, "abc")])) == [(1, "WARD", 2.5, 3)]
+
+
+def test_row_converter_drops_trailing_rowid_without_converters():
+    convert_rows = compile_row_converter((None, None))
+
+    assert list(convert_rows([(1, "ward", "AAAR3sAAEAAAACXAAA")])) == [(1, "ward")]
+
+
+def test_row_converter_drops_trailing_rowid_with_converters():
+    convert_rows = compile_row_converter((None, str.upper))
+
+    assert list(convert_rows([(1, "ward", "AAAR3sAAEAAAACXAAA")])) == [(1, "WARD")]
+
+
+def test_row_converter_is_cached_per_converter_sequence():
+    converters = (None, _clob_to_text, None)
+
+    assert compile_row_converter(converters) is compile_row_converter(converters)
+    assert compile_row_converter(converters) is not compile_row_converter((None, None, _clob_to_text))
+
+
+def test_transform_reads_lob_values():
+    clob = io.StringIO("discharge summary")
+    blob = io.BytesIO(b"\x89PNG")
+    converters = [None, _clob_to_text, _blob_to_bytes]
+
+    rows = transform_oracle_to_postgres_data([(1, clob, blob), (2, None, None)], converters)
+
+    assert list(rows) == [(1, "discharge summary", b"\x89PNG"), (2, None, None)]
+
+
+class KeyBoundsOracle:
+    """Oracle connector reporting fixed primary key bounds"""
+
+    def __init__(self, low, high):
+        self.bounds = (low, high)
+
+    def get_key_bounds(self, table_name, key_column):
+        return self.bounds
+
+
+@pytest.mark.parametrize("low, high, parallelism", [
+    (1, 10_000_000, 4),
+    (1, 10, 3),
+    (-100, 99, 4),
+    (-5_000_000, -1, 7),
+    (1, 2, 4),
+])
+def test_key_ranges_cover_bounds_without_overlap(low, high, parallelism):
+    ranges = plan_key_ranges(KeyBoundsOracle(low, high), "PATIENTS", "ID", SHARD_MIN_ROWS, parallelism)
+
+    assert 1 < len(ranges) <= parallelism
+    assert ranges[0][0] == low
+    assert ranges[-1][1] == high + 1
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert start < end == next_start
+
+
+def test_key_ranges_for_single_key():
+    assert plan_key_ranges(KeyBoundsOracle(7, 7), "PATIENTS", "ID", SHARD_MIN_ROWS, 4) == [(7, 8)]
+
+
+@pytest.mark.parametrize("key_column, row_count, parallelism, bounds", [
+    (None, SHARD_MIN_ROWS, 4, (1, 100)),
+    ("ID", SHARD_MIN_ROWS - 1, 4, (1, 100)),
+    ("ID", SHARD_MIN_ROWS, 1, (1, 100)),
+    ("ID", SHARD_MIN_ROWS, 4, (None, None)),
+    ("ID", SHARD_MIN_ROWS, 4, ("A", "Z")),
+])
+def test_key_ranges_copy_whole_table_when_not_shardable(key_column, row_count, parallelism, bounds):
+    oracle = KeyBoundsOracle(*bounds)
+
+    assert plan_key_ranges(oracle, "PATIENTS", key_column, row_count, parallelism) == [None]
+
+
+class PagedOracle:
+    """Oracle connector paging over in-memory rows keyed by their first value"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetch_sizes = []
+
+    def fetch_data(self, table_name, batch_size, last_key, key_column, columns, key_range, max_bytes):
+        self.fetch_sizes.append(batch_size)
+        batch = []
+        batch_bytes = 0
+        for row in self.rows:
+            if last_key is not None and row[0] <= last_key:
+                continue
+            batch.append(row)
+            batch_bytes += estimate_row_size(row)
+            if len(batch) == batch_size or batch_bytes >= max_bytes:
+                break
+        return batch, batch[-1][0] if batch else last_key
+
+
+def test_batches_cut_short_by_byte_budget_do_not_end_table():
+    rows = [(key, "x" * 1000) for key in range(1, 11)]
+    oracle = PagedOracle(rows)
+    budget = 3 * estimate_row_size(rows[0])
+
+    batches = list(iter_oracle_batches(oracle, "NOTES", 100, budget, "ID", ["ID", "TEXT"]))
+
+    assert [row for batch in batches for row in batch] == rows
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    # The first fetch asks for batch_size rows, later ones for what fits the budget
+    assert oracle.fetch_sizes == [100, 3, 3, 3, 3]
+
+
+def test_tune_batch_rows_fits_budget():
+    rows = [(key, "x" * 1000) for key in range(10)]
+    row_bytes = estimate_row_size(rows[0])
+
+    assert tune_batch_rows(rows, 1000, 5 * row_bytes) == 5
+    assert tune_batch_rows(rows, 2, 5 * row_bytes) == 2
+    assert tune_batch_rows(rows, 1000, 1) == 1
+
+
+def test_create_migration_does_not_store_passwords():
+    request = MigrationRequest(
+        source_db=DatabaseConfig(db_type="oracle", database_name="ORCL", username="clinic", password="s3cret"),
+        target_db=DatabaseConfig(db_type="postgres", database_name="target", username="app", password="hunter2")
+    )
+    background_tasks = BackgroundTasks()
+
+    response = create_migration(request, background_tasks)
+
+    stored = store.get(response.migration_id)["request"]
+    assert "password" not in stored["source_db"]
+    assert "password" not in stored["target_db"]
+    assert stored["source_db"]["username"] == "clinic"
+    # The running migration still gets the credentials
+    assert background_tasks.tasks[0].args == (response.migration_id, request)
+
+
+async def next_event(stream) -> dict:
+    """The migration state carried by the next data event of a stream"""
+    while True:
+        message = await asyncio.wait_for(anext(stream), timeout=5)
+        if message.startswith("data: "):
+            return json.loads(message[len("data: "):])
+
+
+def test_finished_subscriber_wakes_the_others():
+    async def scenario():
+        store.create("sse", {})
+        store.update("sse", status="running")
+        first = (await migration_events("sse")).body_iterator
+        second = (await migration_events("sse")).body_iterator
+        assert (await next_event(first))["status"] == "running"
+        assert (await next_event(second))["status"] == "running"
+        waiting = [asyncio.ensure_future(next_event(s)) for s in (first, second)]
+        await asyncio.sleep(0)
+
+        # The migration finishes, but a new subscriber reads the final state
+        # before the writer's notification reaches the event loop
+        store.update("sse", status="completed")
+        late = (await migration_events("sse")).body_iterator
+        assert (await next_event(late))["status"] == "completed"
+        assert [message async for message in late] == []
+        _notify_progress("sse")
+
+        done, _ = await asyncio.wait(waiting, timeout=1)
+        assert len(done) == 2
+        assert [task.result()["status"] for task in waiting] == ["completed", "completed"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+# src/mcp-db-migrations/tests/test_manager.py
+
+import pytest
+
+from migrations.manager import MigrationStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MigrationStore(str(tmp_path / "migrations.db"))
+    yield store
+    store.close()
+
+
+def test_create_then_get(store):
+    store.create("a1", {"tables": ["PATIENTS"]})
+
+    migration = store.get("a1")
+
+    assert migration["id"] == "a1"
+    assert migration["status"] == "pending"
+    assert migration["request"] == {"tables": ["PATIENTS"]}
+    assert migration["details"] is None
+    assert isinstance(migration["created"], float)
+
+
+def test_update_status_and_details(store):
+    store.create("a1", {})
+
+    store.update("a1", status="running", details={"current_phase": "schema_analysis"})
+    store.update("a1", details={"current_phase": "data_migration"})
+
+    migration = store.get("a1")
+    assert migration["status"] == "running"
+    assert migration["details"] == {"current_phase": "data_migration"}
+
+
+def test_get_unknown_migration(store):
+    assert store.get("missing") is None
+
+
+def test_list_oldest_first(store):
+    for migration_id in ("first", "second", "third"):
+        store.create(migration_id, {})
+
+    assert [m["id"] for m in store.list()] == ["first", "second", "third"]
+
+
+def test_migrations_survive_reopen(tmp_path):
+    path = str(tmp_path / "migrations.db")
+    store = MigrationStore(path)
+    store.create("a1", {})
+    store.update("a1", status="completed", details={"rows_migrated": 10})
+    store.close()
+
+    reopened = MigrationStore(path)
+    try:
+        migration = reopened.get("a1")
+    finally:
+        reopened.close()
+
+    assert migration["status"] == "completed"
+    assert migration["details"] == {"rows_migrated": 10}
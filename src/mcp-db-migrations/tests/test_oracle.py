@@ -0,0 +1,108 @@
+# src/mcp-db-migrations/tests/test_oracle.py
+
+import decimal
+
+import pytest
+
+from engines.oracle import OracleConnector
+from engines.postgres import cast_to_arrow_schema
+
+
+class RecordingCursor:
+    """Cursor returning canned rows and remembering the statements it ran"""
+
+    def __init__(self, statements, rows, names):
+        self.statements = statements
+        self.rows = rows
+        self.description = [(name,) for name in names]
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, rows, names):
+        self.statements = []
+        self.rows = rows
+        self.names = names
+
+    def cursor(self):
+        return RecordingCursor(self.statements, self.rows, self.names)
+
+
+def connect(rows, names) -> OracleConnector:
+    oracle = OracleConnector("localhost", 1521, "clinic", "secret", "ORCL")
+    oracle.connection = RecordingConnection(rows, names)
+    return oracle
+
+
+def test_fetch_data_quotes_columns():
+    oracle = connect([(1, "ward")], ["Id", "LEVEL"])
+
+    rows, next_key = oracle.fetch_data("PATIENTS", 100, 0, "Id", ["Id", "LEVEL"], (0, 10))
+
+    statement = oracle.connection.statements[0]
+    assert 'SELECT t."Id", t."LEVEL" FROM PATIENTS t' in statement
+    assert 't."Id" > :last_key' in statement
+    assert 't."Id" >= :range_start AND t."Id" < :range_end' in statement
+    assert 'ORDER BY t."Id"' in statement
+    assert (rows, next_key) == ([(1, "ward")], 1)
+
+
+def test_fetch_data_without_key_pages_by_rowid():
+    oracle = connect([("ward", "AAAR3sAAEAAAACXAAA")], ["LEVEL", "MIGRATION_ROWID"])
+
+    rows, next_key = oracle.fetch_data("PATIENTS", 100, columns=["LEVEL"])
+
+    statement = oracle.connection.statements[0]
+    assert 'SELECT t."LEVEL", ROWIDTOCHAR(t.ROWID) AS migration_rowid FROM PATIENTS t' in statement
+    assert "ORDER BY t.ROWID" in statement
+    assert next_key == "AAAR3sAAEAAAACXAAA"
+
+
+def test_get_key_bounds_quotes_key_column():
+    oracle = connect([(1, 500)], [])
+
+    assert oracle.get_key_bounds("PATIENTS", "Id") == (1, 500)
+    assert oracle.connection.statements == ['SELECT MIN("Id"), MAX("Id") FROM PATIENTS']
+
+
+class DataFrameConnection:
+    """Connection whose DataFrame fetch returns a NUMBER(38) column like python-oracledb"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def fetch_df_batches(self, statement, parameters, size=None, fetch_decimals=None):
+        import pyarrow
+
+        if fetch_decimals:
+            data = pyarrow.array([decimal.Decimal(v) for v in self.values], pyarrow.decimal128(38, 0))
+        else:
+            data = pyarrow.array([float(v) for v in self.values], pyarrow.float64())
+        yield pyarrow.table({"ID": data})
+
+
+def test_arrow_batches_keep_integers_beyond_float_precision():
+    pyarrow = pytest.importorskip("pyarrow")
+    key = 2 ** 53 + 1
+    big = 12345678901234567891
+    oracle = OracleConnector("localhost", 1521, "clinic", "secret", "ORCL")
+    oracle.connection = DataFrameConnection([key, big])
+    schema = pyarrow.schema([("id", pyarrow.decimal128(38, 0))])
+
+    batches = [
+        cast_to_arrow_schema(batch, schema)
+        for batch in oracle.fetch_arrow_batches("PATIENTS", 100, ["ID"])
+    ]
+
+    assert batches[0].column("id").to_pylist() == [decimal.Decimal(key), decimal.Decimal(big)]
@@ -0,0 +1,165 @@
+# src/mcp-db-migrations/tests/test_postgres.py
+
+import decimal
+import threading
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+
+import engines.postgres
+from engines.postgres import (
+    AdbcConnections,
+    PostgresConnector,
+    _adbc_uri,
+    arrow_schema,
+    cast_to_arrow_schema,
+)
+
+PATIENTS = {
+    "table_name": "patients",
+    "columns": [
+        {"column_name": "id", "data_type": "NUMERIC(10,0)", "nullable": False, "column_default": None},
+        {"column_name": "visits", "data_type": "NUMERIC(5)", "nullable": True, "column_default": None},
+        {"column_name": "balance", "data_type": "NUMERIC(12,2)", "nullable": True, "column_default": None},
+        {"column_name": "name", "data_type": "VARCHAR(100)", "nullable": True, "column_default": None},
+        {"column_name": "gender", "data_type": "CHAR", "nullable": True, "column_default": None},
+        {"column_name": "admitted", "data_type": "TIMESTAMP", "nullable": True, "column_default": None},
+        {"column_name": "weight", "data_type": "DOUBLE PRECISION", "nullable": True, "column_default": None},
+        {"column_name": "photo", "data_type": "BYTEA", "nullable": True, "column_default": None},
+        {"column_name": "score", "data_type": "NUMERIC", "nullable": True, "column_default": None},
+    ],
+    "primary_keys": ["id"]
+}
+
+
+def test_arrow_schema_maps_target_types():
+    columns = ["id", "visits", "balance", "name", "gender", "admitted", "weight", "photo"]
+
+    assert arrow_schema(PATIENTS, columns) == pyarrow.schema([
+        ("id", pyarrow.decimal128(10, 0)),
+        ("visits", pyarrow.decimal128(5, 0)),
+        ("balance", pyarrow.decimal128(12, 2)),
+        ("name", pyarrow.string()),
+        ("gender", pyarrow.string()),
+        ("admitted", pyarrow.timestamp("us")),
+        ("weight", pyarrow.float64()),
+        ("photo", pyarrow.binary()),
+    ])
+
+
+def test_arrow_schema_follows_column_order():
+    assert arrow_schema(PATIENTS, ["name", "id"]).names == ["name", "id"]
+
+
+@pytest.mark.parametrize("data_type", ["NUMERIC", "NUMERIC(5,-2)", "NUMERIC(40,0)", "INTERVAL", "JSONB"])
+def test_arrow_schema_rejects_types_without_arrow_equivalent(data_type):
+    schema = {
+        "table_name": "t",
+        "columns": [{"column_name": "c", "data_type": data_type, "nullable": True, "column_default": None}],
+        "primary_keys": []
+    }
+
+    assert arrow_schema(schema, ["c"]) is None
+
+
+def test_arrow_schema_rejects_table_with_any_unmapped_column():
+    assert arrow_schema(PATIENTS, ["id", "score"]) is None
+
+
+def test_cast_to_arrow_schema_keeps_integer_values():
+    # Oracle's DataFrame fetch returns NUMBER(10) as int64, under the Oracle column name
+    batch = pyarrow.table({"ID": pyarrow.array([1, 2, 1000], pyarrow.int64())})
+
+    cast = cast_to_arrow_schema(batch, arrow_schema(PATIENTS, ["id"]))
+
+    assert cast.schema == pyarrow.schema([("id", pyarrow.decimal128(10, 0))])
+    assert cast.column("id").to_pylist() == [decimal.Decimal(1), decimal.Decimal(2), decimal.Decimal(1000)]
+
+
+def test_cast_to_arrow_schema_rejects_values_that_do_not_fit():
+    batch = pyarrow.table({"ID": pyarrow.array([10 ** 12], pyarrow.int64())})
+
+    with pytest.raises(pyarrow.ArrowInvalid):
+        cast_to_arrow_schema(batch, arrow_schema(PATIENTS, ["id"]))
+
+
+def test_cast_to_arrow_schema_rejects_floats_for_wide_decimals():
+    # float64 holds 2**53 + 1 as 2**53
+    batch = pyarrow.table({"ID": pyarrow.array([float(2 ** 53 + 1)], pyarrow.float64())})
+    schema = pyarrow.schema([("id", pyarrow.decimal128(38, 0))])
+
+    with pytest.raises(pyarrow.ArrowInvalid):
+        cast_to_arrow_schema(batch, schema)
+
+
+def test_adbc_uri_percent_encodes_options():
+    params = PostgresConnector("db", 5432, "app", "p@ss word", "clinic", "require").connection_params
+
+    assert _adbc_uri(params) == (
+        "postgresql://app:p%40ss%20word@db:5432/clinic"
+        "?options=-c%20synchronous_commit%3Doff&sslmode=require"
+    )
+
+
+class FakeAdbcConnection:
+    def __init__(self, fail_rollback=False):
+        self.fail_rollback = fail_rollback
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.fail_rollback:
+            raise RuntimeError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def adbc_connects(monkeypatch):
+    opened = []
+
+    def connect(params):
+        opened.append(FakeAdbcConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(engines.postgres, "_connect_adbc", connect)
+    return opened
+
+
+def test_adbc_connections_reused_within_a_thread(adbc_connects):
+    connections = AdbcConnections()
+
+    first = connections.get({})
+    connections.release(first)
+
+    assert connections.get({}) is first
+    assert first.rollbacks == 1
+    assert len(adbc_connects) == 1
+
+
+def test_adbc_connections_one_per_thread(adbc_connects):
+    connections = AdbcConnections()
+    main = connections.get({})
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(connections.get({})))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main
+    connections.close()
+    assert main.closed and other[0].closed
+
+
+def test_adbc_connection_dropped_when_rollback_fails(adbc_connects):
+    connections = AdbcConnections()
+    broken = connections.get({})
+    broken.fail_rollback = True
+
+    connections.release(broken)
+
+    assert broken.closed
+    assert connections.get({}) is not broken